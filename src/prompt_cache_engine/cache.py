@@ -2,56 +2,160 @@
 
 from __future__ import annotations
 
+import array
 import hashlib
 import logging
+import sys
 import time
-from collections import OrderedDict
-from dataclasses import dataclass
+from collections.abc import Callable, Iterable, Sequence
+from dataclasses import dataclass, field
 from typing import Any
 
-from prompt_cache_engine.exceptions import CacheFullError
+from prompt_cache_engine.exceptions import CacheFullError, TokenizationError
 from prompt_cache_engine.models import BatchAnalysis, CacheConfig, CacheStats, PrefixMatch
-from prompt_cache_engine.trie import RadixTrie
+from prompt_cache_engine.trie import RadixTrie, TrieNode
+from prompt_cache_engine.utils import find_common_prefix_length
 
 logger = logging.getLogger(__name__)
 
 # Estimated bytes per token for KV cache (K + V, fp16, typical hidden dim)
 BYTES_PER_TOKEN_DEFAULT = 2048
 
+_HOST_IS_LITTLE_ENDIAN = sys.byteorder == "little"
 
-@dataclass
+
+@dataclass(slots=True)
 class CacheEntry:
     """A single cached KV state entry.
 
+    The covered token sequence is not copied into the entry; it lives on the
+    trie path ending at ``node`` and is rebuilt on demand by ``tokens``.
+
     Args:
         cache_key: Unique identifier for this entry
-        tokens: The token sequence this entry covers
         kv_data: The actual KV cache data (opaque to the cache manager)
         token_count: Number of tokens in this entry
         memory_bytes: Estimated memory usage in bytes
-        created_at: Timestamp when entry was created
-        last_accessed: Timestamp of last access
+        created_at_ns: Monotonic clock reading (ns) when entry was created
+        last_accessed_ns: Monotonic clock reading (ns) of last access
         access_count: Number of times this entry was accessed
+        prev: Neighbour towards the LRU end of the entry's recency list
+        next: Neighbour towards the MRU end of the entry's recency list
+        node: Trie node holding this entry's cache key
+        bucket: LFU frequency bucket holding this entry (LFU policy only)
     """
 
     cache_key: str
-    tokens: tuple[int, ...]
     kv_data: Any = None
     token_count: int = 0
     memory_bytes: int = 0
-    created_at: float = 0.0
-    last_accessed: float = 0.0
+    created_at_ns: int = 0
+    last_accessed_ns: int = 0
     access_count: int = 0
+    prev: CacheEntry | None = field(default=None, repr=False, compare=False)
+    next: CacheEntry | None = field(default=None, repr=False, compare=False)
+    node: TrieNode | None = field(default=None, repr=False, compare=False)
+    bucket: _FrequencyBucket | None = field(default=None, repr=False, compare=False)
 
     def __post_init__(self) -> None:
-        if not self.token_count:
-            self.token_count = len(self.tokens)
+        if not self.token_count and self.node is not None:
+            self.token_count = self.node.depth
         if not self.memory_bytes:
             self.memory_bytes = self.token_count * BYTES_PER_TOKEN_DEFAULT
-        if not self.created_at:
-            self.created_at = time.time()
-        if not self.last_accessed:
-            self.last_accessed = self.created_at
+        if not self.created_at_ns:
+            self.created_at_ns = time.monotonic_ns()
+        if not self.last_accessed_ns:
+            self.last_accessed_ns = self.created_at_ns
+
+    @property
+    def tokens(self) -> tuple[int, ...]:
+        """The token sequence this entry covers."""
+        return self.node.path_tokens() if self.node is not None else ()
+
+
+@dataclass(slots=True)
+class _EntryList:
+    """Doubly-linked list of entries threaded through their prev/next links.
+
+    Args:
+        head: Least recently used entry
+        tail: Most recently used entry
+    """
+
+    head: CacheEntry | None = None
+    tail: CacheEntry | None = None
+
+    def append(self, entry: CacheEntry) -> None:
+        """Attach an entry at the MRU end.
+
+        Args:
+            entry: Entry to attach
+        """
+        tail = self.tail
+        entry.prev = tail
+        entry.next = None
+        if tail is None:
+            self.head = entry
+        else:
+            tail.next = entry
+        self.tail = entry
+
+    def unlink(self, entry: CacheEntry) -> None:
+        """Detach an entry from the list.
+
+        Args:
+            entry: Entry to detach
+        """
+        prev, nxt = entry.prev, entry.next
+        if prev is None:
+            self.head = nxt
+        else:
+            prev.next = nxt
+        if nxt is None:
+            self.tail = prev
+        else:
+            nxt.prev = prev
+        entry.prev = entry.next = None
+
+
+@dataclass(slots=True)
+class _FrequencyBucket(_EntryList):
+    """Entries sharing one access count, as a rung of the LFU ladder.
+
+    Buckets are chained in ascending count order and only exist while they
+    hold entries, so the lowest bucket always holds the LFU victims.
+
+    Args:
+        count: Access count shared by every entry in the bucket
+        lower: Bucket with the next smaller count
+        higher: Bucket with the next larger count
+    """
+
+    count: int = 0
+    lower: _FrequencyBucket | None = field(default=None, repr=False)
+    higher: _FrequencyBucket | None = field(default=None, repr=False)
+
+
+def _pack_tokens(tokens: tuple[int, ...]) -> bytes:
+    """Pack a token sequence into a contiguous int32 buffer.
+
+    Args:
+        tokens: Token sequence to pack
+
+    Returns:
+        Big-endian int32 bytes, four per token
+
+    Raises:
+        TokenizationError: If a token is not an int or does not fit in int32
+    """
+    try:
+        packed = array.array("i", tokens)
+    except (OverflowError, TypeError) as e:
+        raise TokenizationError(f"Tokens must be int32 values: {e}") from e
+    # array packs in host order; fix it so keys match across platforms
+    if _HOST_IS_LITTLE_ENDIAN:
+        packed.byteswap()
+    return packed.tobytes()
 
 
 def _compute_cache_key(tokens: tuple[int, ...]) -> str:
@@ -62,17 +166,31 @@ def _compute_cache_key(tokens: tuple[int, ...]) -> str:
 
     Returns:
         Hex digest cache key
+
+    Raises:
+        TokenizationError: If the tokens cannot be packed as int32 values
     """
-    token_bytes = b"".join(t.to_bytes(4, byteorder="big", signed=True) for t in tokens)
-    return hashlib.sha256(token_bytes).hexdigest()[:16]
+    # BLAKE2b with an 8-byte digest yields the 16 hex chars directly. The
+    # constructor is CPython's bundled implementation, not an OpenSSL
+    # provider, so there is no FIPS dispatch to opt out of here.
+    return hashlib.blake2b(_pack_tokens(tokens), digest_size=8).hexdigest()
 
 
 class CacheManager:
     """Manages prefix-based KV cache entries with eviction.
 
-    Combines a RadixTrie for efficient prefix matching with an LRU-ordered
-    dict for eviction management. Supports configurable memory limits,
-    TTL expiry, and batch prefix analysis.
+    Combines a RadixTrie for efficient prefix matching with an intrusive
+    doubly-linked recency list for eviction management. Supports configurable
+    memory limits, TTL expiry, and batch prefix analysis.
+
+    Under LFU the entries are threaded into a ladder of frequency buckets
+    instead of one recency list: an access moves an entry to the next rung
+    and eviction takes the least recently used entry of the lowest rung,
+    both in O(1).
+
+    The configuration is read once at construction: the minimum prefix
+    length and TTL are cached as plain ints, and expiry checks and eviction
+    are bound to the policy-specific implementation up front.
     """
 
     def __init__(self, config: CacheConfig | None = None) -> None:
@@ -83,14 +201,42 @@ class CacheManager:
         """
         self.config = config or CacheConfig()
         self._trie = RadixTrie()
-        self._entries: OrderedDict[str, CacheEntry] = OrderedDict()
+        self._entries: dict[str, CacheEntry] = {}
+        # Recency list threaded through the entries: head is LRU, tail is MRU
+        self._lru = _EntryList()
+        # Lowest rung of the LFU ladder; None while empty or under LRU
+        self._lfu_lowest: _FrequencyBucket | None = None
         self._stats = CacheStats()
         self._total_memory_bytes = 0
+        self._now_ns = time.monotonic_ns()
+
+        # Specialize config-dependent paths once instead of re-checking per call
+        self._min_prefix = self.config.min_prefix_length
+        self._ttl_ns = int(self.config.default_ttl_seconds * 1_000_000_000)
+        self._max_entries = self.config.max_entries
+        self._max_memory_bytes = int(self.config.max_memory_mb * 1024 * 1024)
+        self._is_expired: Callable[[CacheEntry], bool] = (
+            self._is_expired_ttl if self._ttl_ns > 0 else self._is_expired_never
+        )
+        lfu_enabled = self.config.eviction_policy == "lfu"
+        self._link: Callable[[CacheEntry], None] = (
+            self._lfu_link if lfu_enabled else self._lru.append
+        )
+        self._relink: Callable[[CacheEntry], None] = (
+            self._lfu_relink if lfu_enabled else self._lru_relink
+        )
+        self._unlink: Callable[[CacheEntry], None] = (
+            self._lfu_unlink if lfu_enabled else self._lru.unlink
+        )
+        self._evict_one: Callable[[], None] = (
+            self._evict_one_lfu if lfu_enabled else self._evict_one_lru
+        )
 
         logger.info(
-            f"CacheManager initialized: max_entries={self.config.max_entries}, "
-            f"max_memory_mb={self.config.max_memory_mb}, "
-            f"policy={self.config.eviction_policy}"
+            "CacheManager initialized: max_entries=%d, max_memory_mb=%s, policy=%s",
+            self.config.max_entries,
+            self.config.max_memory_mb,
+            self.config.eviction_policy,
         )
 
     @property
@@ -100,65 +246,142 @@ class CacheManager:
         self._stats.memory_used_mb = self._total_memory_bytes / (1024 * 1024)
         return self._stats
 
-    def lookup(self, tokens: tuple[int, ...]) -> PrefixMatch:
+    def tick(self) -> int:
+        """Sample the monotonic clock used for access tracking and TTL expiry.
+
+        Each lookup and store samples the clock once; every timestamp and
+        expiry check within that call reuses the same reading.
+
+        Returns:
+            Current monotonic clock reading in nanoseconds
+        """
+        self._now_ns = time.monotonic_ns()
+        return self._now_ns
+
+    def lookup(self, tokens: Sequence[int]) -> PrefixMatch:
         """Look up the longest cached prefix for a token sequence.
 
         Args:
-            tokens: Token sequence to look up
+            tokens: Token sequence to look up; non-tuples are copied to a tuple
 
         Returns:
             PrefixMatch describing the match result
         """
-        self._stats.total_lookups += 1
-        self._stats.total_tokens_requested += len(tokens)
+        # The trie compares tuple slices, so normalize once at the boundary
+        if type(tokens) is not tuple:
+            tokens = tuple(tokens)
+        stats = self._stats
+        num_tokens = len(tokens)
+        stats.total_lookups += 1
+        stats.total_tokens_requested += num_tokens
 
         matched_len, cache_key = self._trie.find_longest_prefix(tokens)
 
-        if cache_key is None or matched_len < self.config.min_prefix_length:
-            self._stats.cache_misses += 1
-            return PrefixMatch(
-                total_length=len(tokens),
-                hit=False,
-            )
-
         # Check entry exists and is not expired
-        entry = self._entries.get(cache_key)
-        if entry is None:
-            self._stats.cache_misses += 1
-            return PrefixMatch(total_length=len(tokens), hit=False)
+        entry = None
+        if cache_key is not None and matched_len >= self._min_prefix:
+            entry = self._entries.get(cache_key)
+            if entry is not None:
+                self.tick()
+                if self._is_expired(entry):
+                    self._evict_entry(cache_key)
+                    entry = None
 
-        if self._is_expired(entry):
-            self._evict_entry(cache_key)
-            self._stats.cache_misses += 1
-            return PrefixMatch(total_length=len(tokens), hit=False)
+        if entry is None:
+            stats.cache_misses += 1
+            return PrefixMatch(total_length=num_tokens)
 
-        # Update access tracking
-        entry.last_accessed = time.time()
-        entry.access_count += 1
-        self._entries.move_to_end(cache_key)
+        # A hit always sampled the clock above
+        self._touch(entry, self._now_ns)
 
-        self._stats.cache_hits += 1
-        self._stats.total_tokens_served += matched_len
+        stats.cache_hits += 1
+        stats.total_tokens_served += matched_len
 
         return PrefixMatch(
             matched_tokens=tokens[:matched_len],
             matched_length=matched_len,
-            total_length=len(tokens),
+            total_length=num_tokens,
             cache_key=cache_key,
             remaining_tokens=tokens[matched_len:],
             hit=True,
         )
 
+    def lookup_many(self, token_sequences: Iterable[Iterable[int]]) -> list[PrefixMatch]:
+        """Look up the longest cached prefix for each of several token sequences.
+
+        Equivalent to calling ``lookup`` on each sequence in order, but the
+        clock is sampled once for the whole batch and statistics are
+        committed in a single update at the end. Every sequence is copied to
+        a tuple before any entry is touched, so a batch with a malformed
+        sequence raises without changing the cache or its statistics.
+
+        Args:
+            token_sequences: Token sequences to look up; non-tuples are
+                copied to tuples
+
+        Returns:
+            One PrefixMatch per input sequence, in input order
+        """
+        sequences = [
+            tokens if type(tokens) is tuple else tuple(tokens) for tokens in token_sequences
+        ]
+        now_ns = self.tick()
+        find_longest_prefix = self._trie.find_longest_prefix
+        get_entry = self._entries.get
+        min_prefix_length = self._min_prefix
+
+        results: list[PrefixMatch] = []
+        hits = tokens_served = tokens_requested = 0
+
+        for tokens in sequences:
+            num_tokens = len(tokens)
+            tokens_requested += num_tokens
+
+            matched_len, cache_key = find_longest_prefix(tokens)
+            entry = None
+            if cache_key is not None and matched_len >= min_prefix_length:
+                entry = get_entry(cache_key)
+                if entry is not None and self._is_expired(entry):
+                    self._evict_entry(cache_key)
+                    entry = None
+
+            if entry is None:
+                results.append(PrefixMatch(total_length=num_tokens))
+                continue
+
+            self._touch(entry, now_ns)
+            hits += 1
+            tokens_served += matched_len
+            results.append(
+                PrefixMatch(
+                    matched_tokens=tokens[:matched_len],
+                    matched_length=matched_len,
+                    total_length=num_tokens,
+                    cache_key=cache_key,
+                    remaining_tokens=tokens[matched_len:],
+                    hit=True,
+                )
+            )
+
+        stats = self._stats
+        stats.total_lookups += len(sequences)
+        stats.cache_hits += hits
+        stats.cache_misses += len(sequences) - hits
+        stats.total_tokens_served += tokens_served
+        stats.total_tokens_requested += tokens_requested
+        return results
+
     def store(
         self,
-        tokens: tuple[int, ...],
+        tokens: Sequence[int],
         kv_data: Any = None,
         memory_bytes: int = 0,
     ) -> str:
         """Store a KV cache entry for a token sequence.
 
         Args:
-            tokens: Token sequence this KV data covers
+            tokens: Token sequence this KV data covers; non-tuples are copied
+                to a tuple
             kv_data: The actual KV cache data (opaque)
             memory_bytes: Override memory estimate (0 = auto-estimate)
 
@@ -167,28 +390,30 @@ class CacheManager:
 
         Raises:
             CacheFullError: If entry cannot be stored after eviction
+            TokenizationError: If the tokens cannot be packed as int32 values
         """
-        if len(tokens) < self.config.min_prefix_length:
-            logger.debug(
-                f"Skipping store: {len(tokens)} tokens < min {self.config.min_prefix_length}"
-            )
+        if type(tokens) is not tuple:
+            tokens = tuple(tokens)
+        num_tokens = len(tokens)
+        if num_tokens < self._min_prefix:
+            logger.debug("Skipping store: %d tokens < min %d", num_tokens, self._min_prefix)
             return ""
 
         cache_key = _compute_cache_key(tokens)
+        now_ns = self.tick()
 
         # Check if already cached
-        if cache_key in self._entries:
-            entry = self._entries[cache_key]
-            entry.last_accessed = time.time()
-            entry.access_count += 1
-            self._entries.move_to_end(cache_key)
+        entry = self._entries.get(cache_key)
+        if entry is not None:
+            self._touch(entry, now_ns)
             return cache_key
 
         entry = CacheEntry(
             cache_key=cache_key,
-            tokens=tokens,
             kv_data=kv_data,
-            memory_bytes=memory_bytes or len(tokens) * BYTES_PER_TOKEN_DEFAULT,
+            token_count=num_tokens,
+            memory_bytes=memory_bytes or num_tokens * BYTES_PER_TOKEN_DEFAULT,
+            created_at_ns=now_ns,
         )
 
         # Evict if needed
@@ -196,12 +421,15 @@ class CacheManager:
 
         # Store entry
         self._entries[cache_key] = entry
-        self._trie.insert(tokens, cache_key)
+        self._link(entry)
+        entry.node = self._trie.insert(tokens, cache_key)
         self._total_memory_bytes += entry.memory_bytes
 
         logger.debug(
-            f"Stored entry: key={cache_key}, tokens={len(tokens)}, "
-            f"memory={entry.memory_bytes / 1024:.1f}KB"
+            "Stored entry: key=%s, tokens=%d, memory=%.1fKB",
+            cache_key,
+            num_tokens,
+            entry.memory_bytes / 1024,
         )
         return cache_key
 
@@ -220,21 +448,26 @@ class CacheManager:
         """Clear all cache entries."""
         count = len(self._entries)
         self._entries.clear()
+        self._lru.head = self._lru.tail = None
+        self._lfu_lowest = None
         self._trie = RadixTrie()
         self._total_memory_bytes = 0
-        logger.info(f"Cache cleared: {count} entries removed")
+        logger.info("Cache cleared: %d entries removed", count)
 
     def analyze_batch(
         self,
-        token_sequences: list[tuple[int, ...]],
+        token_sequences: Sequence[Sequence[int]],
     ) -> BatchAnalysis:
         """Analyze prefix sharing potential within a batch.
 
         Identifies common prefixes across a batch of token sequences
-        and calculates potential deduplication savings.
+        and calculates potential deduplication savings. The batch is sorted
+        once and grouped from adjacent longest-common-prefix lengths, so no
+        per-prefix tuples or temporary trie are built.
 
         Args:
-            token_sequences: List of token sequences to analyze
+            token_sequences: Token sequences to analyze; non-tuples are
+                copied to tuples
 
         Returns:
             BatchAnalysis with sharing statistics
@@ -242,55 +475,83 @@ class CacheManager:
         if not token_sequences:
             return BatchAnalysis()
 
-        # Build a temporary trie for analysis
-        analysis_trie: dict[tuple[int, ...], list[int]] = {}
-
-        for idx, tokens in enumerate(token_sequences):
-            # Find the longest prefix shared with any other sequence
-            for length in range(len(tokens), self.config.min_prefix_length - 1, -1):
-                prefix = tokens[:length]
-                if prefix not in analysis_trie:
-                    analysis_trie[prefix] = []
-                analysis_trie[prefix].append(idx)
-
-        # Find maximal shared prefixes (prefixes appearing 2+ times)
+        # Sorting compares sequences with each other, which only works
+        # across a single sequence type
+        sequences = [
+            tokens if type(tokens) is tuple else tuple(tokens) for tokens in token_sequences
+        ]
+
+        min_length = self._min_prefix
+        num_sequences = len(sequences)
+
+        # Sequences sharing a prefix are contiguous once sorted lexicographically,
+        # so adjacent LCPs are enough to recover every shared-prefix group.
+        order = sorted(range(num_sequences), key=sequences.__getitem__)
+        lcps = [
+            find_common_prefix_length(sequences[order[i]], sequences[order[i + 1]])
+            for i in range(num_sequences - 1)
+        ]
+        lcps.append(0)  # sentinel: closes every open interval at the end
+
+        # Monotonic-stack sweep over the LCP array. Each popped (length, left)
+        # pair is a maximal run order[left..right] sharing a prefix of that
+        # length; runs are emitted deepest-first, so every index lands in the
+        # longest shared prefix it belongs to.
         shared_groups: dict[str, list[int]] = {}
-        assigned: dict[int, int] = {}  # idx -> best prefix length
-
-        sorted_prefixes = sorted(analysis_trie.keys(), key=len, reverse=True)
-        for prefix in sorted_prefixes:
-            indices = analysis_trie[prefix]
-            if len(indices) < 2:
-                continue
-            # Only consider indices not yet assigned to a longer prefix
-            unassigned = [i for i in indices if i not in assigned]
-            if len(unassigned) < 2:
-                continue
-            prefix_key = _compute_cache_key(prefix)[:8]
-            shared_groups[prefix_key] = unassigned
-            for i in unassigned:
-                assigned[i] = len(prefix)
-
-        total_tokens = sum(len(t) for t in token_sequences)
-        savings = sum(
-            assigned.get(i, 0) for i in range(len(token_sequences))
-        )
-        # Subtract one copy per group (must compute at least once)
-        for group_indices in shared_groups.values():
-            if group_indices:
-                max_savings_in_group = max(
-                    assigned.get(i, 0) for i in group_indices
-                )
-                savings -= max_savings_in_group
+        assigned = [False] * num_sequences
+        savings = 0
+        stack: list[tuple[int, int]] = []  # (prefix length, left boundary)
+
+        for right, lcp in enumerate(lcps):
+            left = right
+            while stack and stack[-1][0] > lcp:
+                length, left = stack.pop()
+                unassigned = [i for i in order[left : right + 1] if not assigned[i]]
+                if len(unassigned) < 2:
+                    continue
+                unassigned.sort()
+                # Labels are presentation-only; sequential ids cannot collide
+                prefix_key = f"g{len(shared_groups):04x}"
+                shared_groups[prefix_key] = unassigned
+                for i in unassigned:
+                    assigned[i] = True
+                # One copy per group must still be computed
+                savings += (len(unassigned) - 1) * length
+            if lcp >= min_length and (not stack or stack[-1][0] < lcp):
+                stack.append((lcp, left))
+
+        total_tokens = sum(len(t) for t in sequences)
 
         return BatchAnalysis(
-            batch_size=len(token_sequences),
+            batch_size=len(sequences),
             unique_prefixes=len(shared_groups),
             shared_prefix_groups=shared_groups,
-            potential_savings_tokens=max(0, savings),
+            potential_savings_tokens=savings,
             total_tokens=total_tokens,
         )
 
+    def evict_expired(self) -> int:
+        """Evict every entry whose TTL has elapsed.
+
+        Expiry is otherwise only detected lazily, when a lookup lands on a
+        stale entry; this sweeps the whole cache in one pass.
+
+        Returns:
+            Number of entries evicted
+        """
+        if self._ttl_ns <= 0:
+            return 0
+
+        cutoff_ns = self.tick() - self._ttl_ns
+        expired = [
+            cache_key
+            for cache_key, entry in self._entries.items()
+            if entry.created_at_ns < cutoff_ns
+        ]
+        for cache_key in expired:
+            self._evict_entry(cache_key)
+        return len(expired)
+
     def get_entry(self, cache_key: str) -> CacheEntry | None:
         """Get a cache entry by key without updating access tracking.
 
@@ -311,12 +572,12 @@ class CacheManager:
         Raises:
             CacheFullError: If eviction cannot free enough space
         """
-        max_memory_bytes = int(self.config.max_memory_mb * 1024 * 1024)
+        max_memory_bytes = self._max_memory_bytes
         eviction_attempts = 0
         max_attempts = len(self._entries) + 1
 
         while (
-            len(self._entries) >= self.config.max_entries
+            len(self._entries) >= self._max_entries
             or self._total_memory_bytes + needed_bytes > max_memory_bytes
         ) and self._entries:
             eviction_attempts += 1
@@ -326,19 +587,15 @@ class CacheManager:
                 )
             self._evict_one()
 
-    def _evict_one(self) -> None:
-        """Evict the least recently used entry."""
-        if not self._entries:
-            return
+    def _evict_one_lru(self) -> None:
+        """Evict the least recently used entry (cache must be non-empty)."""
+        # Head of the recency list is LRU
+        self._evict_entry(self._lru.head.cache_key)
 
-        if self.config.eviction_policy == "lru":
-            # OrderedDict: first item is LRU
-            oldest_key = next(iter(self._entries))
-            self._evict_entry(oldest_key)
-        elif self.config.eviction_policy == "lfu":
-            # Find least frequently used
-            lfu_key = min(self._entries, key=lambda k: self._entries[k].access_count)
-            self._evict_entry(lfu_key)
+    def _evict_one_lfu(self) -> None:
+        """Evict the least frequently used entry (cache must be non-empty)."""
+        # Ties on count go to the least recently accessed entry of the rung
+        self._evict_entry(self._lfu_lowest.head.cache_key)
 
     def _evict_entry(self, cache_key: str) -> bool:
         """Evict a specific entry.
@@ -353,15 +610,93 @@ class CacheManager:
         if entry is None:
             return False
 
-        self._trie.remove(entry.tokens)
+        self._unlink(entry)
+        if entry.node is not None:
+            self._trie.remove_node(entry.node)
         self._total_memory_bytes -= entry.memory_bytes
         self._stats.evictions += 1
 
-        logger.debug(f"Evicted entry: key={cache_key}, tokens={entry.token_count}")
+        logger.debug("Evicted entry: key=%s, tokens=%d", cache_key, entry.token_count)
         return True
 
-    def _is_expired(self, entry: CacheEntry) -> bool:
-        """Check if a cache entry has expired.
+    def _touch(self, entry: CacheEntry, now_ns: int) -> None:
+        """Record an access to an entry.
+
+        Args:
+            entry: Entry that was accessed
+            now_ns: Clock reading to stamp the access with
+        """
+        entry.last_accessed_ns = now_ns
+        entry.access_count += 1
+        self._relink(entry)
+
+    def _lru_relink(self, entry: CacheEntry) -> None:
+        """Move an accessed entry to the MRU end of the recency list.
+
+        Args:
+            entry: Entry that was accessed
+        """
+        self._lru.unlink(entry)
+        self._lru.append(entry)
+
+    def _lfu_link(self, entry: CacheEntry) -> None:
+        """Place a newly stored entry on the LFU ladder.
+
+        Args:
+            entry: Entry to place; its count is never above the lowest rung's
+        """
+        lowest = self._lfu_lowest
+        if lowest is None or lowest.count != entry.access_count:
+            lowest = _FrequencyBucket(count=entry.access_count, higher=lowest)
+            if lowest.higher is not None:
+                lowest.higher.lower = lowest
+            self._lfu_lowest = lowest
+        lowest.append(entry)
+        entry.bucket = lowest
+
+    def _lfu_relink(self, entry: CacheEntry) -> None:
+        """Move an accessed entry up to the rung matching its new count.
+
+        Args:
+            entry: Entry whose access count was just incremented
+        """
+        bucket = entry.bucket
+        count = entry.access_count
+        higher = bucket.higher
+        if higher is None or higher.count != count:
+            if bucket.head is bucket.tail:
+                # Sole occupant: re-label the rung in place, order still holds
+                bucket.count = count
+                return
+            higher = _FrequencyBucket(count=count, lower=bucket, higher=higher)
+            if higher.higher is not None:
+                higher.higher.lower = higher
+            bucket.higher = higher
+        self._lfu_unlink(entry)
+        higher.append(entry)
+        entry.bucket = higher
+
+    def _lfu_unlink(self, entry: CacheEntry) -> None:
+        """Take an entry off the LFU ladder, dropping its rung if emptied.
+
+        Args:
+            entry: Entry to detach
+        """
+        bucket = entry.bucket
+        bucket.unlink(entry)
+        entry.bucket = None
+        if bucket.head is not None:
+            return
+        lower, higher = bucket.lower, bucket.higher
+        if lower is None:
+            self._lfu_lowest = higher
+        else:
+            lower.higher = higher
+        if higher is not None:
+            higher.lower = lower
+
+    def _is_expired_ttl(self, entry: CacheEntry) -> bool:
+        """Check if a cache entry has expired as of the last clock tick.
 
         Args:
             entry: Entry to check
@@ -369,6 +704,15 @@ class CacheManager:
         Returns:
             True if expired
         """
-        if self.config.default_ttl_seconds <= 0:
-            return False
-        return (time.time() - entry.created_at) > self.config.default_ttl_seconds
+        return (self._now_ns - entry.created_at_ns) > self._ttl_ns
+
+    def _is_expired_never(self, entry: CacheEntry) -> bool:
+        """Expiry check used when TTL is disabled.
+
+        Args:
+            entry: Entry to check
+
+        Returns:
+            Always False
+        """
+        return False
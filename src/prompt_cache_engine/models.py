@@ -5,7 +5,7 @@ from __future__ import annotations
 from dataclasses import dataclass, field
 
 
-@dataclass
+@dataclass(slots=True)
 class CacheConfig:
     """Configuration for the cache manager.
 
@@ -38,7 +38,7 @@ class CacheConfig:
             )
 
 
-@dataclass
+@dataclass(slots=True)
 class PrefixMatch:
     """Result of a prefix lookup in the cache.
 
@@ -66,7 +66,7 @@ class PrefixMatch:
         return self.matched_length / self.total_length
 
 
-@dataclass
+@dataclass(slots=True)
 class CacheStats:
     """Aggregated cache statistics.
 
@@ -105,7 +105,7 @@ class CacheStats:
         return self.total_tokens_served / self.total_tokens_requested
 
 
-@dataclass
+@dataclass(slots=True)
 class BatchAnalysis:
     """Analysis of prefix sharing within a batch of prompts.
 
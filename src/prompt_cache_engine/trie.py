@@ -3,8 +3,11 @@
 from __future__ import annotations
 
 import logging
+from collections.abc import Sequence
 from dataclasses import dataclass, field
 
+from prompt_cache_engine.utils import find_common_prefix_length
+
 logger = logging.getLogger(__name__)
 
 # Estimated bytes per KV cache entry per token per layer
@@ -12,7 +15,7 @@ logger = logging.getLogger(__name__)
 DEFAULT_BYTES_PER_TOKEN = 2048
 
 
-@dataclass
+@dataclass(slots=True)
 class TrieNode:
     """Node in the radix trie.
 
@@ -24,12 +27,27 @@ class TrieNode:
         children: Child nodes keyed by first token of their segment
         cache_key: Key for the cached KV entry at this node (if any)
         depth: Total token depth from root to end of this node's segment
+        parent: Node this one hangs off (None for the root)
     """
 
     tokens: tuple[int, ...] = ()
     children: dict[int, TrieNode] = field(default_factory=dict)
     cache_key: str | None = None
     depth: int = 0
+    parent: TrieNode | None = field(default=None, repr=False, compare=False)
+
+    def path_tokens(self) -> tuple[int, ...]:
+        """Reconstruct the full token sequence from the root to this node.
+
+        Returns:
+            Concatenation of every edge label on the path from the root
+        """
+        segments: list[tuple[int, ...]] = []
+        node: TrieNode | None = self
+        while node is not None:
+            segments.append(node.tokens)
+            node = node.parent
+        return tuple(token for segment in reversed(segments) for token in segment)
 
 
 class RadixTrie:
@@ -52,65 +70,128 @@ class RadixTrie:
 
     def insert(
         self,
-        tokens: tuple[int, ...],
+        tokens: Sequence[int],
         cache_key: str,
-    ) -> None:
+    ) -> TrieNode | None:
         """Insert a token sequence with its cache key.
 
+        The returned node keeps its identity for as long as it holds the key:
+        later splits and merges only relabel its edge and re-parent it.
+
         Args:
-            tokens: Token sequence to insert
+            tokens: Token sequence to insert; non-tuples are copied to a tuple
             cache_key: Key identifying the cached KV entry
+
+        Returns:
+            Node now holding cache_key, or None if tokens is empty
         """
+        # Edges are matched by tuple slice compares, so normalize up front
+        if type(tokens) is not tuple:
+            tokens = tuple(tokens)
         if not tokens:
-            return
+            return None
+        return self._insert_below(self.root, tokens, cache_key)
 
-        node = self.root
+    def insert_extend(
+        self,
+        node: TrieNode,
+        extra_tokens: Sequence[int],
+        cache_key: str,
+    ) -> TrieNode | None:
+        """Insert the sequence formed by a node's path plus extra tokens.
+
+        Equivalent to ``insert(node.path_tokens() + extra_tokens, cache_key)``
+        but resumes from ``node`` instead of descending from the root, so
+        extending a cached prefix costs O(len(extra_tokens)). Typical use is
+        chaining conversation turns off the node ``insert`` returned for the
+        previous turn.
+
+        Args:
+            node: This trie's root, or a node returned by ``insert`` or
+                ``insert_extend`` that still holds its key
+            extra_tokens: Tokens continuing the node's path; non-tuples are
+                copied to a tuple
+            cache_key: Key identifying the cached KV entry
+
+        Returns:
+            Node now holding cache_key, or None if node is the root and
+            extra_tokens is empty (mirroring ``insert`` of an empty sequence)
+
+        Raises:
+            ValueError: If node holds no key and is not the root, e.g. a node
+                whose entry was removed and which may be detached
+        """
+        if node.cache_key is None and node is not self.root:
+            raise ValueError("Cannot extend from a node that holds no cache key")
+        if type(extra_tokens) is not tuple:
+            extra_tokens = tuple(extra_tokens)
+        if not extra_tokens and node is self.root:
+            return None
+        return self._insert_below(node, extra_tokens, cache_key)
+
+    def _insert_below(
+        self,
+        node: TrieNode,
+        tokens: tuple[int, ...],
+        cache_key: str,
+    ) -> TrieNode:
+        """Insert a token suffix beneath a node.
+
+        Args:
+            node: Node the suffix continues from
+            tokens: Tokens following the node's path
+            cache_key: Key identifying the cached KV entry
+
+        Returns:
+            Node now holding cache_key
+        """
+        leaf_depth = node.depth + len(tokens)
         pos = 0
 
         while pos < len(tokens):
             first_token = tokens[pos]
+            child = node.children.get(first_token)
 
-            if first_token not in node.children:
+            if child is None:
                 # No matching child -- create a new leaf
                 new_node = TrieNode(
                     tokens=tokens[pos:],
                     cache_key=cache_key,
-                    depth=len(tokens),
+                    depth=leaf_depth,
+                    parent=node,
                 )
                 node.children[first_token] = new_node
                 self._size += 1
-                logger.debug(
-                    f"Inserted new leaf: depth={len(tokens)}, key={cache_key}"
-                )
-                return
+                logger.debug("Inserted new leaf: depth=%d, key=%s", leaf_depth, cache_key)
+                return new_node
 
-            child = node.children[first_token]
             child_tokens = child.tokens
 
-            # Find the longest common prefix between remaining tokens and child edge
-            common_len = 0
-            while (
-                common_len < len(child_tokens)
-                and pos + common_len < len(tokens)
-                and child_tokens[common_len] == tokens[pos + common_len]
-            ):
-                common_len += 1
-
-            if common_len == len(child_tokens):
-                # Full match on child edge -- descend
-                pos += common_len
+            # Whole-edge match is one C-level tuple compare -- descend
+            edge_end = pos + len(child_tokens)
+            segment = tokens[pos:edge_end]
+            if segment == child_tokens:
+                pos = edge_end
                 node = child
                 continue
 
-            # Partial match -- split the edge
+            # Find the longest common prefix between remaining tokens and child edge
+            common_len = find_common_prefix_length(child_tokens, segment)
+
+            # Partial match -- split the edge. The split is fully built
+            # before the child is touched, so a failure cannot leave it
+            # relabelled but still hanging off the old parent.
+            child_rest = child_tokens[common_len:]
             split_node = TrieNode(
                 tokens=child_tokens[:common_len],
-                depth=node.depth + common_len if hasattr(node, 'depth') else common_len,
+                children={child_rest[0]: child},
+                depth=node.depth + common_len,
+                parent=node,
             )
 
             # Move original child under split node
-            child.tokens = child_tokens[common_len:]
-            split_node.children[child.tokens[0]] = child
+            child.tokens = child_rest
+            child.parent = split_node
 
             # Add new branch for remaining tokens
             remaining = tokens[pos + common_len:]
@@ -118,37 +199,41 @@ class RadixTrie:
                 new_leaf = TrieNode(
                     tokens=remaining,
                     cache_key=cache_key,
-                    depth=len(tokens),
+                    depth=leaf_depth,
+                    parent=split_node,
                 )
                 split_node.children[remaining[0]] = new_leaf
             else:
+                new_leaf = split_node
                 split_node.cache_key = cache_key
 
             node.children[first_token] = split_node
             self._size += 1
-            logger.debug(
-                f"Split edge at common_len={common_len}, key={cache_key}"
-            )
-            return
+            logger.debug("Split edge at common_len=%d, key=%s", common_len, cache_key)
+            return new_leaf
 
         # Reached end of tokens exactly at an existing node
         if node.cache_key is None:
             self._size += 1
         node.cache_key = cache_key
+        return node
 
     def find_longest_prefix(
         self,
-        tokens: tuple[int, ...],
+        tokens: Sequence[int],
     ) -> tuple[int, str | None]:
         """Find the longest cached prefix matching the given tokens.
 
         Args:
-            tokens: Token sequence to search for
+            tokens: Token sequence to search for; non-tuples are copied to a
+                tuple
 
         Returns:
             Tuple of (matched_length, cache_key) where cache_key is None
             if no cached prefix was found
         """
+        if type(tokens) is not tuple:
+            tokens = tuple(tokens)
         if not tokens:
             return 0, None
 
@@ -162,29 +247,22 @@ class RadixTrie:
             best_length = 0
             best_key = node.cache_key
 
-        while pos < len(tokens):
-            first_token = tokens[pos]
-
-            if first_token not in node.children:
+        num_tokens = len(tokens)
+        while pos < num_tokens:
+            # Single dict probe per level on the lookup hot path
+            child = node.children.get(tokens[pos])
+            if child is None:
                 break
 
-            child = node.children[first_token]
             child_tokens = child.tokens
 
-            # Match child edge tokens
-            match_len = 0
-            while (
-                match_len < len(child_tokens)
-                and pos + match_len < len(tokens)
-                and child_tokens[match_len] == tokens[pos + match_len]
-            ):
-                match_len += 1
-
-            if match_len < len(child_tokens):
+            # Match the whole child edge in one tuple compare
+            edge_end = pos + len(child_tokens)
+            if tokens[pos:edge_end] != child_tokens:
                 # Partial match on edge -- can't descend further
                 break
 
-            pos += match_len
+            pos = edge_end
             node = child
 
             if node.cache_key is not None:
@@ -193,77 +271,128 @@ class RadixTrie:
 
         return best_length, best_key
 
-    def remove(self, tokens: tuple[int, ...]) -> bool:
+    def find_all_prefixes(self, tokens: Sequence[int]) -> list[tuple[int, str]]:
+        """Find every cached prefix of the given tokens in a single descent.
+
+        Cached prefixes of a query all lie on the one root-to-leaf path it
+        follows, so no failure links are needed: each keyed node passed on
+        the way down is a match.
+
+        Args:
+            tokens: Token sequence to search for; non-tuples are copied to a
+                tuple
+
+        Returns:
+            List of (matched_length, cache_key) pairs, shortest prefix first;
+            the last pair is what ``find_longest_prefix`` returns
+        """
+        if type(tokens) is not tuple:
+            tokens = tuple(tokens)
+        matches: list[tuple[int, str]] = []
+        node = self.root
+        pos = 0
+        num_tokens = len(tokens)
+
+        while pos < num_tokens:
+            child = node.children.get(tokens[pos])
+            if child is None:
+                break
+
+            child_tokens = child.tokens
+            edge_end = pos + len(child_tokens)
+            if tokens[pos:edge_end] != child_tokens:
+                break
+
+            pos = edge_end
+            node = child
+
+            if node.cache_key is not None:
+                matches.append((pos, node.cache_key))
+
+        return matches
+
+    def remove(self, tokens: Sequence[int]) -> bool:
         """Remove a cached prefix entry.
 
         Args:
-            tokens: Token sequence to remove
+            tokens: Token sequence to remove; non-tuples are copied to a tuple
 
         Returns:
             True if an entry was removed, False if not found
         """
+        if type(tokens) is not tuple:
+            tokens = tuple(tokens)
         if not tokens:
             return False
 
         # Navigate to the node
         node = self.root
         pos = 0
-        path: list[tuple[TrieNode, int]] = []  # (parent, first_token)
 
         while pos < len(tokens):
-            first_token = tokens[pos]
-            if first_token not in node.children:
+            child = node.children.get(tokens[pos])
+            if child is None:
                 return False
 
-            path.append((node, first_token))
-            child = node.children[first_token]
-
-            match_len = 0
-            while (
-                match_len < len(child.tokens)
-                and pos + match_len < len(tokens)
-                and child.tokens[match_len] == tokens[pos + match_len]
-            ):
-                match_len += 1
-
-            if match_len < len(child.tokens):
+            edge_end = pos + len(child.tokens)
+            if tokens[pos:edge_end] != child.tokens:
                 return False
 
-            pos += match_len
+            pos = edge_end
             node = child
 
+        return self.remove_node(node)
+
+    def remove_node(self, node: TrieNode) -> bool:
+        """Remove the cached prefix entry held by a node.
+
+        Nodes left without a cache key or children are pruned on the way
+        back up towards the root, and a keyless node left with a single child
+        is merged into that child. The child absorbs the edge, so nodes that
+        hold keys keep their identity.
+
+        Args:
+            node: Node returned by ``insert`` for the entry
+
+        Returns:
+            True if an entry was removed, False if the node held none
+        """
         if node.cache_key is None:
             return False
 
         node.cache_key = None
         self._size -= 1
+
+        parent = node.parent
+        while parent is not None and node.cache_key is None and not node.children:
+            del parent.children[node.tokens[0]]
+            node, parent = parent, parent.parent
+
+        if parent is not None and node.cache_key is None and len(node.children) == 1:
+            # Splice out the pass-through node; the detached node itself is
+            # left untouched so stale references still see their old path
+            (child,) = node.children.values()
+            child.tokens = node.tokens + child.tokens
+            child.parent = parent
+            parent.children[child.tokens[0]] = child
         return True
 
     def get_all_entries(self) -> list[tuple[tuple[int, ...], str]]:
         """Get all cached entries as (token_sequence, cache_key) pairs.
 
+        Entries are returned in depth-first order. The walk uses an explicit
+        stack, so deep tries do not hit the interpreter recursion limit.
+
         Returns:
             List of all cached token sequences with their cache keys
         """
         entries: list[tuple[tuple[int, ...], str]] = []
-        self._collect_entries(self.root, (), entries)
+        stack: list[tuple[TrieNode, tuple[int, ...]]] = [(self.root, ())]
+        while stack:
+            node, prefix = stack.pop()
+            current = prefix + node.tokens
+            if node.cache_key is not None:
+                entries.append((current, node.cache_key))
+            # Reversed so children pop in insertion order
+            stack.extend((child, current) for child in reversed(node.children.values()))
         return entries
-
-    def _collect_entries(
-        self,
-        node: TrieNode,
-        prefix: tuple[int, ...],
-        entries: list[tuple[tuple[int, ...], str]],
-    ) -> None:
-        """Recursively collect all entries from the trie.
-
-        Args:
-            node: Current node
-            prefix: Token prefix accumulated so far
-            entries: List to append entries to
-        """
-        current = prefix + node.tokens
-        if node.cache_key is not None:
-            entries.append((current, node.cache_key))
-        for child in node.children.values():
-            self._collect_entries(child, current, entries)
@@ -3,11 +3,26 @@
 from __future__ import annotations
 
 import logging
+from collections.abc import Sequence
+from functools import lru_cache
+from zlib import crc32
 
 from prompt_cache_engine.models import BatchAnalysis, CacheStats
 
 logger = logging.getLogger(__name__)
 
+# Tokens compared per slice in find_common_prefix_length; long enough to
+# amortise the slice allocation, short enough to stop near the mismatch
+_PREFIX_COMPARE_CHUNK = 16
+
+# tokenize_simple ids are non-negative int32 values
+_TOKEN_ID_MASK = 0x7FFFFFFF
+
+# Word -> id memo shared by every tokenize_simple call, so each distinct word
+# is hashed once and maps to a single int object; reset when it fills up
+_WORD_IDS: dict[str, int] = {}
+_WORD_IDS_MAX_SIZE = 1 << 16
+
 
 def format_stats_report(stats: CacheStats) -> str:
     """Format cache statistics as a human-readable report.
@@ -18,21 +33,22 @@ def format_stats_report(stats: CacheStats) -> str:
     Returns:
         Formatted report string
     """
-    lines = [
-        "=== Prompt Cache Engine Statistics ===",
-        f"Entries:        {stats.entries_count}",
-        f"Memory Used:    {stats.memory_used_mb:.2f} MB",
-        f"Total Lookups:  {stats.total_lookups}",
-        f"Cache Hits:     {stats.cache_hits}",
-        f"Cache Misses:   {stats.cache_misses}",
-        f"Hit Rate:       {stats.hit_rate:.1%}",
-        f"Tokens Served:  {stats.total_tokens_served}",
-        f"Tokens Requested: {stats.total_tokens_requested}",
-        f"Token Savings:  {stats.token_savings_rate:.1%}",
-        f"Evictions:      {stats.evictions}",
-        "=====================================",
-    ]
-    return "\n".join(lines)
+    # Adjacent literals compile to one f-string: a single BUILD_STRING, no
+    # intermediate list or join
+    return (
+        "=== Prompt Cache Engine Statistics ===\n"
+        f"Entries:        {stats.entries_count}\n"
+        f"Memory Used:    {stats.memory_used_mb:.2f} MB\n"
+        f"Total Lookups:  {stats.total_lookups}\n"
+        f"Cache Hits:     {stats.cache_hits}\n"
+        f"Cache Misses:   {stats.cache_misses}\n"
+        f"Hit Rate:       {stats.hit_rate:.1%}\n"
+        f"Tokens Served:  {stats.total_tokens_served}\n"
+        f"Tokens Requested: {stats.total_tokens_requested}\n"
+        f"Token Savings:  {stats.token_savings_rate:.1%}\n"
+        f"Evictions:      {stats.evictions}\n"
+        "====================================="
+    )
 
 
 def format_batch_analysis(analysis: BatchAnalysis) -> str:
@@ -44,54 +60,96 @@ def format_batch_analysis(analysis: BatchAnalysis) -> str:
     Returns:
         Formatted report string
     """
-    lines = [
-        "=== Batch Prefix Analysis ===",
-        f"Batch Size:       {analysis.batch_size}",
-        f"Unique Prefixes:  {analysis.unique_prefixes}",
-        f"Total Tokens:     {analysis.total_tokens}",
-        f"Saveable Tokens:  {analysis.potential_savings_tokens}",
-        f"Dedup Ratio:      {analysis.dedup_ratio:.1%}",
-    ]
-
+    groups = ""
     if analysis.shared_prefix_groups:
-        lines.append("Shared Groups:")
-        for key, indices in analysis.shared_prefix_groups.items():
-            lines.append(f"  {key}: {len(indices)} prompts")
-
-    lines.append("==============================")
-    return "\n".join(lines)
-
-
+        groups = "Shared Groups:\n" + "".join(
+            [
+                f"  {key}: {len(indices)} prompts\n"
+                for key, indices in analysis.shared_prefix_groups.items()
+            ]
+        )
+
+    return (
+        "=== Batch Prefix Analysis ===\n"
+        f"Batch Size:       {analysis.batch_size}\n"
+        f"Unique Prefixes:  {analysis.unique_prefixes}\n"
+        f"Total Tokens:     {analysis.total_tokens}\n"
+        f"Saveable Tokens:  {analysis.potential_savings_tokens}\n"
+        f"Dedup Ratio:      {analysis.dedup_ratio:.1%}\n"
+        f"{groups}"
+        "=============================="
+    )
+
+
+@lru_cache(maxsize=4096)
 def tokenize_simple(text: str) -> tuple[int, ...]:
     """Simple whitespace tokenizer for demonstration purposes.
 
     In production, use a real tokenizer (tiktoken, sentencepiece, etc.).
+    Results are memoized, since shared system prompts are tokenized over and
+    over; the returned tuples are immutable, so sharing them is safe.
 
     Args:
         text: Text to tokenize
 
     Returns:
-        Tuple of token IDs (hash-based)
+        Tuple of token IDs (CRC32-based, stable across processes)
+    """
+    # Building a list first lets tuple() size itself once instead of
+    # draining a generator. Misses are tested with `is None`, since 0 is a
+    # valid id.
+    get_id = _WORD_IDS.get
+    return tuple(
+        [token_id if (token_id := get_id(w)) is not None else _word_id(w) for w in text.split()]
+    )
+
+
+def _word_id(word: str) -> int:
+    """Compute and memoize the token id for a single word.
+
+    Args:
+        word: Whitespace-delimited word
+
+    Returns:
+        Non-negative int32 token id
     """
-    words = text.split()
-    return tuple(hash(w) % 100000 for w in words)
+    # CRC32 is unsalted, unlike hash(), so ids survive interpreter restarts;
+    # the mask keeps them within the int32 range used for cache keys
+    token_id = crc32(word.encode()) & _TOKEN_ID_MASK
+    if len(_WORD_IDS) >= _WORD_IDS_MAX_SIZE:
+        _WORD_IDS.clear()
+    _WORD_IDS[word] = token_id
+    return token_id
 
 
 def find_common_prefix_length(
-    seq_a: tuple[int, ...],
-    seq_b: tuple[int, ...],
+    seq_a: Sequence[int],
+    seq_b: Sequence[int],
 ) -> int:
     """Find the length of the common prefix between two sequences.
 
     Args:
-        seq_a: First token sequence
-        seq_b: Second token sequence
+        seq_a: First token sequence; non-tuples are copied to a tuple
+        seq_b: Second token sequence; non-tuples are copied to a tuple
 
     Returns:
         Length of common prefix
     """
-    length = min(len(seq_a), len(seq_b))
-    for i in range(length):
-        if seq_a[i] != seq_b[i]:
-            return i
-    return length
+    # Slice compares must yield a single bool, which mixed types (list vs
+    # tuple) and array types (element-wise ==) do not guarantee
+    if type(seq_a) is not tuple:
+        seq_a = tuple(seq_a)
+    if type(seq_b) is not tuple:
+        seq_b = tuple(seq_b)
+    n = min(len(seq_a), len(seq_b))
+    # Skip equal chunks with C-level slice compares, then scan the first
+    # differing chunk token by token
+    start = 0
+    while start < n:
+        end = start + _PREFIX_COMPARE_CHUNK
+        if seq_a[start:end] != seq_b[start:end]:
+            for i in range(start, n):
+                if seq_a[i] != seq_b[i]:
+                    return i
+        start = end
+    return n
@@ -2,9 +2,13 @@
 
 from __future__ import annotations
 
+import array
 import time
 
+import pytest
+
 from prompt_cache_engine.cache import CacheManager, _compute_cache_key
+from prompt_cache_engine.exceptions import TokenizationError
 from prompt_cache_engine.models import CacheConfig
 
 
@@ -27,6 +31,17 @@ class TestCacheKey:
         key = _compute_cache_key((1, 2, 3))
         assert len(key) == 16
 
+    def test_key_independent_of_host_byte_order(self) -> None:
+        """Keys hash the big-endian packing, so they match across platforms."""
+        assert _compute_cache_key((1, 2, 3)) == "10c571e30a37781d"
+        assert _compute_cache_key((-1, 2**31 - 1)) == "76c1c4aebba58963"
+
+    @pytest.mark.parametrize("tokens", [(1, 2**40), (1, 2.5)])
+    def test_non_int32_tokens_raise(self, tokens: tuple) -> None:
+        """Tokens that cannot be packed as int32 raise TokenizationError."""
+        with pytest.raises(TokenizationError):
+            _compute_cache_key(tokens)
+
 
 class TestCacheManagerLookupAndStore:
     """Tests for lookup and store operations."""
@@ -56,6 +71,63 @@ class TestCacheManagerLookupAndStore:
         assert match.matched_length == 4
         assert match.remaining_tokens == (5, 6, 7, 8)
 
+    def test_non_tuple_tokens_are_normalized(self, small_cache: CacheManager) -> None:
+        """Lists and arrays match entries stored from tuples and vice versa."""
+        small_cache.store([1, 2, 3, 4])
+        small_cache.store(array.array("i", (5, 6, 7, 8)))
+
+        match = small_cache.lookup((1, 2, 3, 4, 9))
+        assert match.hit
+        assert match.matched_tokens == (1, 2, 3, 4)
+        assert small_cache.lookup([5, 6, 7, 8]).hit
+        assert all(m.hit for m in small_cache.lookup_many([[1, 2, 3, 4], range(5, 9)]))
+
+    def test_entry_tokens_rebuilt_from_trie(self, small_cache: CacheManager) -> None:
+        """Entries recover their token sequence from the trie path."""
+        small_cache.store((1, 2, 3, 4, 5))
+        key = small_cache.store((1, 2, 3, 4))
+        entry = small_cache.get_entry(key)
+        assert entry is not None
+        assert entry.tokens == (1, 2, 3, 4)
+        assert entry.token_count == 4
+
+    def test_lookup_many_matches_individual_lookups(self, small_cache: CacheManager) -> None:
+        """lookup_many returns per-sequence results and aggregates stats."""
+        small_cache.store((1, 2, 3, 4))
+        queries = [(1, 2, 3, 4, 5), (9, 9, 9), (1, 2, 3, 4)]
+
+        matches = small_cache.lookup_many(queries)
+
+        assert [m.hit for m in matches] == [True, False, True]
+        assert matches[0].remaining_tokens == (5,)
+        stats = small_cache.stats
+        assert stats.total_lookups == 3
+        assert stats.cache_hits == 2
+        assert stats.cache_misses == 1
+        assert stats.total_tokens_served == 8
+        assert stats.total_tokens_requested == 12
+
+    def test_lookup_many_bad_sequence_leaves_cache_untouched(
+        self, small_cache: CacheManager
+    ) -> None:
+        """A malformed sequence fails the batch before any entry is touched."""
+        key = small_cache.store((1, 2, 3))
+
+        with pytest.raises(TypeError):
+            small_cache.lookup_many(((1, 2, 3), 5))
+
+        entry = small_cache.get_entry(key)
+        assert entry is not None
+        assert entry.access_count == 0
+        assert small_cache.stats.total_lookups == 0
+
+    def test_lookup_many_accepts_generators(self, small_cache: CacheManager) -> None:
+        """The batch may be any iterable of sequences."""
+        small_cache.store((1, 2, 3))
+        matches = small_cache.lookup_many((1, 2, n) for n in (3, 4))
+        assert [m.hit for m in matches] == [True, False]
+        assert small_cache.stats.total_lookups == 2
+
     def test_min_prefix_length_enforced_on_store(self, small_cache: CacheManager) -> None:
         """Tokens shorter than min_prefix_length are not stored."""
         key = small_cache.store((1,))  # min_prefix_length is 2
@@ -115,6 +187,19 @@ class TestCacheManagerEviction:
         assert match_new.hit
         assert cache.stats.evictions >= 1
 
+    def test_lru_eviction_respects_recent_access(self) -> None:
+        """A lookup refreshes recency so the untouched entry is evicted."""
+        config = CacheConfig(max_entries=2, min_prefix_length=2)
+        cache = CacheManager(config=config)
+
+        cache.store((1, 2, 3))
+        cache.store((4, 5, 6))
+        cache.lookup((1, 2, 3))
+        cache.store((7, 8, 9))
+
+        assert cache.lookup((1, 2, 3)).hit
+        assert not cache.lookup((4, 5, 6)).hit
+
     def test_lfu_eviction(self) -> None:
         """LFU eviction removes least frequently used."""
         config = CacheConfig(max_entries=2, min_prefix_length=2, eviction_policy="lfu")
@@ -135,6 +220,43 @@ class TestCacheManagerEviction:
         assert match_kept.hit
         assert not match_evicted.hit
 
+    def test_lfu_ties_evict_least_recently_used(self) -> None:
+        """Among equally used entries, LFU evicts the least recent one."""
+        config = CacheConfig(max_entries=2, min_prefix_length=2, eviction_policy="lfu")
+        cache = CacheManager(config=config)
+
+        cache.store((1, 2, 3))
+        cache.store((4, 5, 6))
+        cache.lookup((4, 5, 6))
+        cache.lookup((1, 2, 3))
+        # Both have one access; (4,5,6) was touched longer ago
+        cache.store((7, 8, 9))
+
+        assert cache.lookup((1, 2, 3)).hit
+        assert not cache.lookup((4, 5, 6)).hit
+
+    def test_lfu_skips_emptied_frequency_counts(self) -> None:
+        """LFU evicts from the lowest count still held once lower ones empty."""
+        config = CacheConfig(max_entries=3, min_prefix_length=2, eviction_policy="lfu")
+        cache = CacheManager(config=config)
+
+        cache.store((1, 2, 3))
+        cache.store((4, 5, 6))
+        cache.store((7, 8, 9))
+        for _ in range(3):
+            cache.lookup((1, 2, 3))
+        cache.lookup((4, 5, 6))
+        cache.lookup((7, 8, 9))
+        cache.lookup((7, 8, 9))
+
+        # Counts are now 3, 1 and 2; nothing is left at zero
+        cache.store((10, 11, 12))
+
+        assert not cache.lookup((4, 5, 6)).hit
+        assert cache.lookup((1, 2, 3)).hit
+        assert cache.lookup((7, 8, 9)).hit
+        assert cache.lookup((10, 11, 12)).hit
+
     def test_manual_eviction(self, small_cache: CacheManager) -> None:
         """Manual eviction removes specific entry."""
         tokens = (1, 2, 3, 4, 5)
@@ -192,6 +314,28 @@ class TestCacheManagerTTL:
         match = cache.lookup(tokens)
         assert match.hit
 
+    def test_evict_expired_sweeps_stale_entries(self) -> None:
+        """evict_expired removes every entry past its TTL in one pass."""
+        config = CacheConfig(default_ttl_seconds=0.1, min_prefix_length=2)
+        cache = CacheManager(config=config)
+        cache.store((1, 2, 3))
+        cache.store((4, 5, 6))
+        time.sleep(0.15)
+        cache.store((7, 8, 9))
+
+        assert cache.evict_expired() == 2
+        assert cache.stats.entries_count == 1
+        assert cache.lookup((7, 8, 9)).hit
+
+    def test_tick_advances_monotonic_clock(self, small_cache: CacheManager) -> None:
+        """tick() returns non-decreasing readings used to stamp entries."""
+        first = small_cache.tick()
+        key = small_cache.store((1, 2, 3, 4, 5))
+        entry = small_cache.get_entry(key)
+        assert entry is not None
+        assert entry.created_at_ns >= first
+        assert small_cache.tick() >= entry.created_at_ns
+
 
 class TestCacheManagerBatchAnalysis:
     """Tests for batch prefix analysis."""
@@ -224,3 +368,40 @@ class TestCacheManagerBatchAnalysis:
         assert analysis.batch_size == 3
         assert analysis.unique_prefixes >= 1
         assert analysis.potential_savings_tokens > 0
+
+    def test_nested_prefixes_assigned_to_deepest_group(self, small_cache: CacheManager) -> None:
+        """Each sequence is grouped under the longest prefix it shares."""
+        sequences = [
+            (1, 2, 3, 4, 5, 6),
+            (1, 2, 3, 4, 5, 7),
+            (1, 2, 8, 9),
+            (1, 2, 8, 10),
+            (1, 2, 11),
+        ]
+        analysis = small_cache.analyze_batch(sequences)
+        groups = sorted(analysis.shared_prefix_groups.values())
+        assert groups == [[0, 1], [2, 3]]
+        # 5 tokens saved on the deep pair, 3 on the shallower pair
+        assert analysis.potential_savings_tokens == 8
+
+    def test_group_labels_are_sequential(self, small_cache: CacheManager) -> None:
+        """Group labels are distinct sequential ids, one per group."""
+        sequences = [
+            (1, 2, 3, 4, 5),
+            (1, 2, 3, 4, 6),
+            (7, 8, 9, 10, 11),
+            (7, 8, 9, 10, 12),
+        ]
+        analysis = small_cache.analyze_batch(sequences)
+        assert sorted(analysis.shared_prefix_groups) == ["g0000", "g0001"]
+
+    def test_mixed_sequence_types(self, small_cache: CacheManager) -> None:
+        """Lists and arrays are grouped alongside equal tuples."""
+        sequences = [
+            (1, 2, 3, 4, 5),
+            [1, 2, 3, 4, 6],
+            array.array("i", [1, 2, 3, 4, 7]),
+        ]
+        analysis = small_cache.analyze_batch(sequences)
+        assert list(analysis.shared_prefix_groups.values()) == [[0, 1, 2]]
+        assert analysis.potential_savings_tokens == 8
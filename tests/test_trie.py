@@ -68,6 +68,51 @@ class TestRadixTrieInsertAndLookup:
         assert key_b == "key-b"
         assert key_c == "key-c"
 
+    def test_find_all_prefixes(self, trie: RadixTrie) -> None:
+        """All cached prefixes on the query path are returned, shortest first."""
+        trie.insert((1, 2), "short")
+        trie.insert((1, 2, 3, 4), "long")
+        trie.insert((1, 2, 3, 5), "sibling")
+
+        assert trie.find_all_prefixes((1, 2, 3, 4, 9)) == [(2, "short"), (4, "long")]
+        assert trie.find_all_prefixes((1, 2, 3)) == [(2, "short")]
+        assert trie.find_all_prefixes((7, 8)) == []
+
+    def test_insert_extend_resumes_from_node(self, trie: RadixTrie) -> None:
+        """Extending a stored node matches inserting the full sequence."""
+        turn1 = trie.insert((1, 2, 3), "turn1")
+        assert turn1 is not None
+        turn2 = trie.insert_extend(turn1, (4, 5), "turn2")
+        trie.insert((1, 2, 3, 4, 9), "fork")
+        turn3 = trie.insert_extend(turn2, (6,), "turn3")
+
+        assert turn3.depth == 6
+        assert turn3.path_tokens() == (1, 2, 3, 4, 5, 6)
+        assert trie.find_longest_prefix((1, 2, 3, 4, 5, 6, 7)) == (6, "turn3")
+        assert trie.find_longest_prefix((1, 2, 3, 4, 5)) == (5, "turn2")
+        assert trie.size == 4
+
+    def test_insert_extend_empty_rekeys_node(self, trie: RadixTrie) -> None:
+        """Extending by nothing re-keys the node; from the root it is a no-op."""
+        node = trie.insert((1, 2), "old")
+        assert node is not None
+        assert trie.insert_extend(node, (), "new") is node
+        assert trie.find_longest_prefix((1, 2)) == (2, "new")
+        assert trie.insert_extend(trie.root, (), "root") is None
+        assert trie.size == 1
+
+    def test_insert_extend_rejects_keyless_node(self, trie: RadixTrie) -> None:
+        """A node whose entry was removed is not a valid resumption point."""
+        trie.insert((1, 2), "short")
+        stale = trie.insert((1, 2, 3, 4), "long")
+        assert stale is not None
+        trie.remove_node(stale)
+
+        with pytest.raises(ValueError):
+            trie.insert_extend(stale, (5,), "orphan")
+        assert trie.size == 1
+        assert trie.find_longest_prefix((1, 2, 3, 4, 5)) == (2, "short")
+
     def test_empty_tokens_insert(self, trie: RadixTrie) -> None:
         """Empty token sequence is a no-op."""
         trie.insert((), "key-empty")
@@ -89,6 +134,19 @@ class TestRadixTrieInsertAndLookup:
         trie.insert((5, 6), "c")
         assert trie.size == 3
 
+    def test_mixed_list_and_tuple_inputs(self, trie: RadixTrie) -> None:
+        """List inputs behave exactly like the equivalent tuples."""
+        trie.insert((1, 2, 3, 4), "a")
+        trie.insert([1, 2, 3, 4, 5], "b")
+        trie.insert([1, 2, 7], "c")
+
+        assert trie.find_longest_prefix((1, 2, 3, 4)) == (4, "a")
+        assert trie.find_longest_prefix([1, 2, 3, 4, 5, 6]) == (5, "b")
+        assert trie.find_all_prefixes([1, 2, 3, 4, 5]) == [(4, "a"), (5, "b")]
+        assert trie.remove([1, 2, 7]) is True
+        assert trie.size == 2
+        assert trie.get_all_entries() == [((1, 2, 3, 4), "a"), ((1, 2, 3, 4, 5), "b")]
+
 
 class TestRadixTrieRemove:
     """Tests for entry removal."""
@@ -117,6 +175,39 @@ class TestRadixTrieRemove:
         """Removing empty tokens returns False."""
         assert trie.remove(()) is False
 
+    def test_remove_node_prunes_empty_branch(self, trie: RadixTrie) -> None:
+        """Removing by node prunes nodes left without keys or children."""
+        trie.insert((1, 2), "short")
+        node = trie.insert((1, 2, 3, 4), "long")
+        assert node is not None
+        assert node.path_tokens() == (1, 2, 3, 4)
+
+        assert trie.remove_node(node) is True
+        assert trie.remove_node(node) is False
+        assert trie.size == 1
+        short_node = trie.root.children[1]
+        assert short_node.cache_key == "short"
+        assert short_node.children == {}
+
+    def test_remove_merges_single_child_chain(self, trie: RadixTrie) -> None:
+        """A keyless node left with one child is merged into that child."""
+        trie.insert((1, 2, 3, 4), "a")
+        kept = trie.insert((1, 2, 5, 6), "b")
+        trie.remove((1, 2, 3, 4))
+
+        assert trie.root.children[1] is kept
+        assert kept.tokens == (1, 2, 5, 6)
+        assert kept.path_tokens() == (1, 2, 5, 6)
+        assert trie.find_longest_prefix((1, 2, 5, 6, 7)) == (4, "b")
+
+    def test_inserted_node_survives_split(self, trie: RadixTrie) -> None:
+        """A key-holding node keeps its identity when its edge is split."""
+        node = trie.insert((1, 2, 3, 4), "long")
+        trie.insert((1, 2, 5), "branch")
+        assert node is not None
+        assert node.cache_key == "long"
+        assert node.path_tokens() == (1, 2, 3, 4)
+
 
 class TestRadixTrieGetAllEntries:
     """Tests for collecting all entries."""
@@ -135,6 +226,16 @@ class TestRadixTrieGetAllEntries:
         keys = {key for _, key in entries}
         assert keys == {"a", "b", "c"}
 
+    def test_deep_trie_does_not_recurse(self, trie: RadixTrie) -> None:
+        """Collection handles chains deeper than the recursion limit."""
+        depth = 1200
+        for length in range(1, depth + 1):
+            trie.insert(tuple(range(length)), f"k{length}")
+
+        entries = trie.get_all_entries()
+        assert len(entries) == depth
+        assert entries[-1] == (tuple(range(depth)), f"k{depth}")
+
     @pytest.mark.parametrize(
         "tokens,expected_key",
         [
@@ -2,8 +2,11 @@
 
 from __future__ import annotations
 
+import array
+
 import pytest
 
+from prompt_cache_engine import utils
 from prompt_cache_engine.models import CacheStats
 from prompt_cache_engine.utils import (
     find_common_prefix_length,
@@ -26,6 +29,42 @@ class TestTokenizeSimple:
         """Same text produces same tokens."""
         assert tokenize_simple("hello world") == tokenize_simple("hello world")
 
+    def test_stable_across_processes(self) -> None:
+        """Token ids do not depend on the per-process string hash seed."""
+        assert tokenize_simple("hello world") == (907060870, 980881731)
+
+    def test_repeated_text_is_memoized(self) -> None:
+        """Tokenizing the same text twice serves the second call from cache."""
+        text = "a system prompt reused across many requests"
+        assert tokenize_simple(text) is tokenize_simple(text)
+
+    def test_repeated_words_share_ids(self) -> None:
+        """A word maps to the same int object wherever it appears."""
+        first = tokenize_simple("shared preamble alpha")
+        second = tokenize_simple("beta shared preamble")
+        assert first[0] is second[1]
+        assert first[1] is second[2]
+
+    def test_zero_id_is_memoized(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """A word whose id is 0 is hashed once, not treated as a memo miss."""
+        hashed: list[bytes] = []
+
+        def fake_crc32(data: bytes) -> int:
+            hashed.append(data)
+            return 0
+
+        # Start from empty memos and leave them empty, so the fake id
+        # neither depends on earlier tests nor leaks into later ones
+        monkeypatch.setattr(utils, "crc32", fake_crc32)
+        monkeypatch.setattr(utils, "_WORD_IDS", {})
+        tokenize_simple.cache_clear()
+        try:
+            assert tokenize_simple("zero-id-word") == (0,)
+            assert tokenize_simple("zero-id-word zero-id-word") == (0, 0)
+            assert hashed == [b"zero-id-word"]
+        finally:
+            tokenize_simple.cache_clear()
+
     def test_empty_string(self) -> None:
         """Empty string produces empty tuple."""
         assert tokenize_simple("") == ()
@@ -72,6 +111,21 @@ class TestFindCommonPrefixLength:
         """Sequences of different lengths handled correctly."""
         assert find_common_prefix_length(seq_a, seq_b) == expected
 
+    def test_non_tuple_sequences(self) -> None:
+        """Lists, arrays and ranges compare by value against tuples."""
+        seq = tuple(range(40))
+        mixed = list(range(25)) + [-1] * 15
+        assert find_common_prefix_length(seq, mixed) == 25
+        assert find_common_prefix_length(array.array("i", seq), range(40)) == 40
+
+    @pytest.mark.parametrize("mismatch_at", [0, 15, 16, 17, 47, 99])
+    def test_long_sequences(self, mismatch_at: int) -> None:
+        """Mismatches are located exactly on either side of chunk boundaries."""
+        seq_a = tuple(range(100))
+        seq_b = seq_a[:mismatch_at] + (-1,) + seq_a[mismatch_at + 1 :]
+        assert find_common_prefix_length(seq_a, seq_b) == mismatch_at
+        assert find_common_prefix_length(seq_a, seq_a[:60]) == 60
+
 
 class TestFormatStatsReport:
     """Tests for stats report formatting."""